@@ -1,9 +1,14 @@
 import os
 import sys
+import io
 import csv
 import time
+import array
+import select
 import signal
+import socket
 import argparse
+import threading
 import configparser
 import warnings
 import psutil
@@ -13,9 +18,6 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple, Dict, Any
 
-# 导入内存分析模块
-from memory_analyzer import analyze_log
-
 def get_program_dir():
     # """
     # 获取程序的实际运行目录：
@@ -32,59 +34,118 @@ def get_program_dir():
     return program_dir
 
 
-# 全局变量：控制程序退出
-EXIT_FLAG = False
+# 全局变量：控制程序退出（由信号等待线程/信号处理函数置位，主循环检查）
+EXIT_EVENT = threading.Event()
+# 需要捕获的退出信号：Ctrl+C、系统终止信号（Linux/macOS）
+EXIT_SIGNALS = {signal.SIGINT, signal.SIGTERM}
+# 信号唤醒套接字对（仅在无sigwait的平台使用，配合signal.set_wakeup_fd唤醒select等待）
+_WAKEUP_READ: Optional[socket.socket] = None
+_WAKEUP_WRITE: Optional[socket.socket] = None
+# 进程对象缓存（PID -> psutil.Process），避免重复构造Process及PID复用校验
+_PROC_CACHE: Dict[int, psutil.Process] = {}
 # 默认配置
 PROGRAM_DIR = get_program_dir()
 DEFAULT_CONFIG_PATH = PROGRAM_DIR / "./config.ini"
 DEFAULT_INTERVAL = 5  # 默认采样间隔（秒）
 DEFAULT_LOG_PATH = PROGRAM_DIR / "./mem_monitor_logs"  # 默认日志目录
 DEFAULT_MAX_LOG_SIZE = 100 * 1024 * 1024  # 默认单日志文件最大size（100MB）
+LOG_BATCH_SIZE = 32  # 日志批量写入行数（攒满后统一写入并刷新）
+LOG_BUFFER_SIZE = 1 << 20  # 日志写缓冲区上限（1MB，达到后立即写入）
+LOG_FLUSH_MAX_AGE = 2.0  # 缓存日志行的最长滞留时间（秒），超过后立即写入，进程被强杀时最多丢失该时长的数据
+LOG_SIZE_RECONCILE_ROWS = 100  # 每写入多少行用fstat校准一次日志文件大小
 MEMORY_UNIT = "MB"  # 内存单位（支持 B/KB/MB/GB）
 UNIT_CONVERTER = {"B": 1, "KB": 1024, "MB": 1024 * 1024, "GB": 1024 * 1024 * 1024}
+INV_UNIT = 1.0 / UNIT_CONVERTER[MEMORY_UNIT]  # 字节 -> 内存单位的换算系数（乘法代替除法）
+SYSTEM = platform.system()  # 当前操作系统（启动时确定一次）
+TOTAL_MEM_REFRESH_SAMPLES = 60  # 每隔多少轮采样（含采集失败的轮次）刷新一次系统总内存
+SAMPLE_HISTORY_SIZE = 3600  # 内存中保留的最近采样数（环形缓冲区容量）
+REMARK_PROC_TERMINATED = "进程已终止"  # 采样时发现目标进程已退出的备注
+# 日志表头及行格式（字段均为已知安全内容，直接格式化，绕过csv.writer）
+LOG_LINE_END = "\r\n"  # 与csv.writer默认行尾保持一致
+LOG_HEADER = (
+    f"采样时间(ISO8601),进程PID,进程名称,物理内存({MEMORY_UNIT}),虚拟内存({MEMORY_UNIT}),"
+    f"专用工作集({MEMORY_UNIT}),物理内存占系统总内存(%),备注{LOG_LINE_END}"
+)
+_ROW_FMT = "{t},{pid},{name},{rss:.2f},{vms:.2f},{priv:.2f},{pct:.2f},{remark}" + LOG_LINE_END
+_FAILED_ROW_FMT = "{t},{pid},{name},,,,,{remark}" + LOG_LINE_END
+_CSV_SPECIAL_CHARS = (",", '"', "\r", "\n")
+# 单次遍历替换字符的转换表：CSV特殊字符、文件名非法字符（含Windows保留字符）
+_CSV_SAFE = str.maketrans(dict.fromkeys(_CSV_SPECIAL_CHARS, "_"))
+_NAME_SAFE = str.maketrans(dict.fromkeys('/\\:*?"<>|', "_"))
 
 # 屏蔽NumPy版本警告（核心修复1）
 warnings.filterwarnings("ignore", category=UserWarning, module="numpy")
-# 提前设置matplotlib后端为Agg（无GUI，避免Qt依赖冲突）（核心修复2）
-try:
-    import matplotlib
-
-    matplotlib.use("Agg")  # 强制使用非交互式后端，不加载Qt
-    import matplotlib.pyplot as plt
-except ImportError:
-    plt = None
 
 
 def signal_handler(signum, frame):
-    """信号处理：捕获Ctrl+C/退出信号，优雅终止"""
-    global EXIT_FLAG
-    print("\n[INFO] 接收到退出信号，正在优雅终止监控...")
-    EXIT_FLAG = True
+    """信号处理：捕获Ctrl+C/退出信号，仅置位退出事件（不做I/O，保证异步安全）"""
+    EXIT_EVENT.set()
+
+
+def request_exit():
+    """从其他线程请求退出：置位退出事件并唤醒主循环的等待"""
+    EXIT_EVENT.set()
+    if _WAKEUP_WRITE is not None:
+        try:
+            _WAKEUP_WRITE.send(b"\0")
+        except OSError:
+            pass  # 缓冲区已满说明已有待处理的唤醒
+
+
+def wait_for_exit(timeout: float) -> bool:
+    """
+    等待指定时长，期间收到退出信号时立即返回
+    返回值：是否已请求退出
+    """
+    if _WAKEUP_READ is None:
+        return EXIT_EVENT.wait(timeout)
+    # 信号到达时C层处理函数向唤醒套接字写入数据，select立即返回
+    readable, _, _ = select.select([_WAKEUP_READ], [], [], max(0.0, timeout))
+    if readable:
+        try:
+            while _WAKEUP_READ.recv(64):
+                pass
+        except OSError:
+            pass  # 已读空（非阻塞套接字）
+    return EXIT_EVENT.is_set()
+
+
+def _sigwait_loop():
+    """信号等待线程：同步等待退出信号并置位退出事件"""
+    signal.sigwait(EXIT_SIGNALS)
+    EXIT_EVENT.set()
 
 
 def init_signal():
     """初始化信号处理"""
-    signal.signal(signal.SIGINT, signal_handler)  # Ctrl+C
-    signal.signal(signal.SIGTERM, signal_handler)  # 系统终止信号（Linux/macOS）
+    if hasattr(signal, "pthread_sigmask") and hasattr(signal, "sigwait"):
+        # POSIX：屏蔽退出信号（需在创建其他线程前执行，使其继承屏蔽字），
+        # 由专用线程通过sigwait同步接收，避免在异步信号上下文中执行Python代码
+        signal.pthread_sigmask(signal.SIG_BLOCK, EXIT_SIGNALS)
+        threading.Thread(target=_sigwait_loop, name="sigwait", daemon=True).start()
+        return
+
+    # 无sigwait的平台（如Windows）：注册信号处理函数，并通过set_wakeup_fd
+    # 让信号唤醒主循环的select等待（Windows下仅支持套接字，故使用socketpair）
+    global _WAKEUP_READ, _WAKEUP_WRITE
+    _WAKEUP_READ, _WAKEUP_WRITE = socket.socketpair()
+    _WAKEUP_READ.setblocking(False)
+    _WAKEUP_WRITE.setblocking(False)
+    signal.set_wakeup_fd(_WAKEUP_WRITE.fileno())
+    for signum in EXIT_SIGNALS:
+        signal.signal(signum, signal_handler)
     if sys.platform == "win32":
         # Windows下兼容Ctrl+C
         try:
             import win32api
 
-            win32api.SetConsoleCtrlHandler(lambda sig: signal_handler(sig, None), True)
+            win32api.SetConsoleCtrlHandler(lambda sig: request_exit(), True)
         except ImportError:
             print(
                 "[WARNING] 未安装pywin32，Windows下Ctrl+C可能无法正常捕获（建议执行：pip install pywin32）"
             )
 
 
-def convert_memory(value: int, unit: str = MEMORY_UNIT) -> float:
-    """转换内存单位（字节 -> 指定单位）"""
-    if value <= 0:
-        return 0.0
-    return round(value / UNIT_CONVERTER[unit], 2)
-
-
 def check_numpy_version():
     """检测NumPy版本，提示兼容问题"""
     try:
@@ -150,31 +211,53 @@ def load_config(config_path: str) -> Dict[str, Any]:
     return config_data
 
 
+def get_cached_process(pid: int) -> psutil.Process:
+    """从进程对象缓存中获取Process（不存在则创建并缓存）"""
+    proc = _PROC_CACHE.get(pid)
+    if proc is None:
+        proc = psutil.Process(pid)
+        _PROC_CACHE[pid] = proc
+    return proc
+
+
 def list_running_processes() -> list:
-    """列出当前运行的进程（去重+关键信息），按进程名称小写排序"""
+    """
+    列出当前运行的进程（去重+关键信息），按进程名称小写排序
+    启动时间保留原始时间戳（create_time_raw），仅在显示时格式化
+    """
     processes = []
-    seen_pids = set()
-    for proc in psutil.process_iter(["pid", "name", "create_time", "username"]):
+    pids = psutil.pids()
+    # 清理已退出进程的缓存，避免缓存无限增长
+    for stale_pid in _PROC_CACHE.keys() - set(pids):
+        del _PROC_CACHE[stale_pid]
+    for pid in pids:
         try:
-            if proc.pid in seen_pids:
-                continue
-            seen_pids.add(proc.pid)
-            create_time = datetime.fromtimestamp(proc.info["create_time"]).strftime(
-                "%Y-%m-%d %H:%M:%S"
-            )
+            proc = get_cached_process(pid)
+            name = proc.name() or "未知进程"
+            create_time_raw = proc.create_time()
+            try:
+                username = proc.username()
+            except psutil.AccessDenied:
+                username = None
             processes.append(
-                {
-                    "pid": proc.pid,
-                    "name": proc.info["name"] or "未知进程",
-                    "create_time": create_time,
-                    "username": proc.info["username"] or "未知用户",
-                }
+                (
+                    name.lower(),
+                    {
+                        "pid": pid,
+                        "name": name,
+                        "create_time_raw": create_time_raw,
+                        "username": username or "未知用户",
+                    },
+                )
             )
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+        except psutil.NoSuchProcess:
+            _PROC_CACHE.pop(pid, None)
             continue
-    # 按进程名称小写排序（核心优化点）
-    processes.sort(key=lambda x: x["name"].lower())
-    return processes
+        except psutil.AccessDenied:
+            continue
+    # 按进程名称小写排序（核心优化点），小写名称在收集时预先计算
+    processes.sort(key=lambda x: x[0])
+    return [entry for _, entry in processes]
 
 
 def select_process_interactive() -> Optional[int]:
@@ -187,8 +270,11 @@ def select_process_interactive() -> Optional[int]:
 
     # 打印进程列表
     for idx, proc in enumerate(processes, 1):
+        create_time = datetime.fromtimestamp(proc["create_time_raw"]).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
         print(
-            f"{idx:3d} | PID:{proc['pid']:6d} | 名称:{proc['name']:<20} | 启动时间:{proc['create_time']} | 用户:{proc['username']}"
+            f"{idx:3d} | PID:{proc['pid']:6d} | 名称:{proc['name']:<20} | 启动时间:{create_time} | 用户:{proc['username']}"
         )
 
     # 选择进程
@@ -232,11 +318,16 @@ def get_process_by_pid(pid: int) -> Optional[psutil.Process]:
 def get_process_by_name(name: str) -> Optional[int]:
     """通过进程名查找PID（处理重名，让用户选择）"""
     matched_procs = []
-    for proc in psutil.process_iter(["pid", "name"]):
+    name_lower = name.lower()
+    for pid in psutil.pids():
         try:
-            if name.lower() in proc.info["name"].lower():
-                matched_procs.append({"pid": proc.pid, "name": proc.info["name"]})
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            proc_name = get_cached_process(pid).name()
+            if name_lower in proc_name.lower():
+                matched_procs.append({"pid": pid, "name": proc_name})
+        except psutil.NoSuchProcess:
+            _PROC_CACHE.pop(pid, None)
+            continue
+        except psutil.AccessDenied:
             continue
 
     if not matched_procs:
@@ -264,19 +355,22 @@ def get_process_by_name(name: str) -> Optional[int]:
                 print("[ERROR] 输入无效，请输入数字序号！")
 
 
-def get_log_file_path(proc_pid: int, proc_name: str, log_dir: str) -> str:
+def get_log_file_path(proc_pid: int, proc_name: str, log_dir: Path) -> str:
     """生成日志文件路径（格式：mem_monitor_进程名_PID_启动时间.log）"""
     start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_proc_name = proc_name.replace("/", "_").replace("\\", "_").replace(":", "_")
+    safe_proc_name = proc_name.translate(_NAME_SAFE)
     log_filename = f"mem_monitor_{safe_proc_name}_{proc_pid}_{start_time}.log"
-    return os.path.join(log_dir, log_filename)
+    return str(log_dir / log_filename)
 
 
-def init_log_dir(log_dir: str) -> None:
+def init_log_dir(log_dir: Path) -> None:
     """初始化日志目录（不存在则创建）"""
-    if not os.path.exists(log_dir):
+    try:
         os.makedirs(log_dir)
-        print(f"[INFO] 日志目录已创建：{log_dir}")
+    except FileExistsError:
+        # 目录已存在（直接尝试创建，省去单独的存在性检查）
+        return
+    print(f"[INFO] 日志目录已创建：{log_dir}")
 
 
 def get_next_log_file(current_log_path: str) -> str:
@@ -302,62 +396,162 @@ def get_next_log_file(current_log_path: str) -> str:
     return new_log_path
 
 
-def write_log_header(log_file: csv.writer) -> None:
-    """写入日志表头（新增专用工作集字段）"""
-    log_file.writerow(
-        [
-            "采样时间(ISO8601)",
-            "进程PID",
-            "进程名称",
-            f"物理内存({MEMORY_UNIT})",
-            f"虚拟内存({MEMORY_UNIT})",
-            f"专用工作集({MEMORY_UNIT})",  # 新增字段
-            "物理内存占系统总内存(%)",
-            "备注",
-        ]
-    )
+def open_log_file(log_path: str) -> int:
+    """以追加模式打开日志文件，返回原始文件描述符（绕过文本I/O层）"""
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    return os.open(log_path, flags, 0o644)
+
+
+def needs_csv_quoting(value: str) -> bool:
+    """判断字段是否包含需要CSV转义的字符"""
+    return any(c in value for c in _CSV_SPECIAL_CHARS)
+
+
+def sanitize_csv_field(value: str) -> str:
+    """将字段中的CSV特殊字符替换为下划线，使其可直接拼接进日志行"""
+    return value.translate(_CSV_SAFE)
+
+
+def format_csv_row(fields: list) -> str:
+    """通过csv.writer格式化一行（仅用于字段可能含逗号/引号的兜底场景）"""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator=LOG_LINE_END).writerow(fields)
+    return buf.getvalue()
+
+
+def write_all(log_fd: int, data) -> None:
+    """将数据完整写入文件描述符（处理os.write部分写入的情况）"""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(log_fd, view):]
+
+
+def flush_log_buffer(log_fd: int, pending: bytearray) -> None:
+    """将缓存的日志数据一次性写入文件并清空缓存"""
+    if pending:
+        write_all(log_fd, pending)
+        pending.clear()
+
+
+def write_log_header(log_fd: int) -> int:
+    """写入日志表头（新增专用工作集字段），返回写入的字节数"""
+    header = LOG_HEADER.encode("utf-8")
+    write_all(log_fd, header)
+    return len(header)
+
+
+class SampleBuffer:
+    """
+    最近采样数据的环形缓冲区（列式存储）
+    时间戳（epoch秒）与各内存指标分别存放在array('d')中，每个采样仅占32字节，
+    长时间监控也不会产生大量小对象
+    """
+
+    def __init__(self, capacity: int = SAMPLE_HISTORY_SIZE):
+        self.capacity = capacity
+        self.size = 0
+        self._next = 0  # 下一次写入的位置
+        self.timestamps = array.array("d", bytes(8 * capacity))
+        self.rss = array.array("d", bytes(8 * capacity))
+        self.vms = array.array("d", bytes(8 * capacity))
+        self.private = array.array("d", bytes(8 * capacity))
+
+    def append(self, timestamp: float, rss: float, vms: float, private: float) -> None:
+        """追加一次采样，缓冲区满时覆盖最旧的数据"""
+        i = self._next
+        self.timestamps[i] = timestamp
+        self.rss[i] = rss
+        self.vms[i] = vms
+        self.private[i] = private
+        self._next = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
 
+    def stats(self, column: str) -> Tuple[float, float, float]:
+        """返回指定列（rss/vms/private）当前保留数据的(平均值, 最大值, 最小值)"""
+        if self.size == 0:
+            return 0.0, 0.0, 0.0
+        values = getattr(self, column)
+        if self.size < self.capacity:
+            values = values[: self.size]
+        return sum(values) / self.size, max(values), min(values)
 
-def sample_process_memory(proc: psutil.Process) -> Tuple[Optional[dict], str]:
-    """采样进程内存数据（新增专用工作集）"""
+
+def _sample_windows(proc: psutil.Process) -> Tuple[int, int, int]:
+    """Windows：返回(物理内存, 虚拟内存, 专用工作集)字节数，专用工作集直接取private字段"""
+    mem_info = proc.memory_full_info()
+    return mem_info.rss, mem_info.vms, mem_info.private
+
+
+def _sample_linux_uss(proc: psutil.Process) -> Tuple[int, int, int]:
+    """Linux：返回(物理内存, 虚拟内存, 专用内存)字节数，专用内存取uss（精准私有内存）"""
+    mem_info = proc.memory_full_info()
+    return mem_info.rss, mem_info.vms, mem_info.uss
+
+
+def _sample_linux_shared(proc: psutil.Process) -> Tuple[int, int, int]:
+    """Linux：返回(物理内存, 虚拟内存, 专用内存)字节数，无uss时用rss-shared估算"""
+    mem_info = proc.memory_full_info()
+    return mem_info.rss, mem_info.vms, mem_info.rss - mem_info.shared
+
+
+def _sample_default(proc: psutil.Process) -> Tuple[int, int, int]:
+    """其他系统：返回(物理内存, 虚拟内存, 0)字节数，无专用工作集数据"""
+    mem_info = proc.memory_info()
+    return mem_info.rss, mem_info.vms, 0
+
+
+def select_memory_sampler(proc: psutil.Process, system_type: str = SYSTEM):
+    """
+    启动时探测一次目标进程可用的内存字段，选择对应的专用采样函数，
+    采样循环中不再重复判断操作系统及字段是否存在
+    """
+    if system_type not in ("Windows", "Linux"):
+        return _sample_default
     try:
-        # 基础内存信息
-        mem_info = (
-            proc.memory_full_info()
-            if hasattr(proc, "memory_full_info")
-            else proc.memory_info()
-        )
-        rss = convert_memory(mem_info.rss)  # 物理内存（工作集）
-        vms = convert_memory(mem_info.vms)  # 虚拟内存
-        # private = (
-        #     convert_memory(mem_info.private) if hasattr(mem_info, "private") else 0.0
-        # )  # 专用工作集
+        mem_full = proc.memory_full_info()
+    except psutil.NoSuchProcess:
+        # 进程已退出，由采样循环检测并结束监控
+        return _sample_default
+    except psutil.AccessDenied:
+        print("[WARNING] 无权限读取进程完整内存信息，专用工作集将记录为0")
+        return _sample_default
+    if hasattr(mem_full, "private"):
+        return _sample_windows
+    if hasattr(mem_full, "uss"):
+        return _sample_linux_uss
+    if hasattr(mem_full, "shared"):
+        return _sample_linux_shared
+    # 无任何可用字段时专用工作集保持0
+    return _sample_default
+
+
+def get_pct_factor() -> float:
+    """读取系统总内存，返回「字节 -> 占系统总内存百分比」的换算系数"""
+    return 100.0 / psutil.virtual_memory().total
+
+
+def sample_process_memory(
+    proc: psutil.Process, proc_name: str, memory_sampler, pct_factor: float
+) -> Tuple[Optional[dict], str]:
+    """
+    采样进程内存数据（新增专用工作集），内存值为未取整的浮点数
+    进程已退出时由采样函数抛出NoSuchProcess，无需预先调用is_running()
+    """
+    try:
+        # 基础内存信息（字节）
+        rss_bytes, vms_bytes, private_bytes = memory_sampler(proc)
+        rss = rss_bytes * INV_UNIT  # 物理内存（工作集）
+        vms = vms_bytes * INV_UNIT  # 虚拟内存
         # 跨平台兼容获取专用工作集（修复Linux下private恒为0的问题）
-        private = 0.0
-        system_type = platform.system()
-        if system_type == "Windows":
-            # Windows系统沿用原有逻辑
-            private = convert_memory(mem_info.private) if hasattr(mem_info, "private") else 0.0
-        elif system_type == "Linux":
-            # Linux系统优先取uss（精准私有内存），无uss则用rss-shared估算
-            if hasattr(mem_info, "uss"):
-                private = convert_memory(mem_info.uss)
-            elif hasattr(mem_info, "shared"):
-                private = convert_memory(mem_info.rss - mem_info.shared)
-            # 无任何可用字段时保持0.0
-
-        # 系统总内存
-        total_system_mem = psutil.virtual_memory().total
-        mem_percent = round((mem_info.rss / total_system_mem) * 100, 2)
-
-        # 采样时间（ISO8601，毫秒级）
-        sample_time = datetime.now().isoformat(timespec="milliseconds")
-
-        # 进程名称（避免进程退出导致获取失败）
-        proc_name = proc.name() if proc.is_running() else "进程已终止"
+        private = max(0, private_bytes) * INV_UNIT
+        mem_percent = rss_bytes * pct_factor
+
+        # 采样时间（epoch秒，写日志时再格式化为ISO8601）
+        sample_ts = time.time()
 
         return {
-            "sample_time": sample_time,
+            "sample_ts": sample_ts,
             "pid": proc.pid,
             "name": proc_name,
             "rss": rss,
@@ -366,7 +560,7 @@ def sample_process_memory(proc: psutil.Process) -> Tuple[Optional[dict], str]:
             "mem_percent": mem_percent,
         }, ""
     except psutil.NoSuchProcess:
-        return None, "进程已终止"
+        return None, REMARK_PROC_TERMINATED
     except psutil.AccessDenied:
         return None, "无权限读取内存信息"
     except Exception as e:
@@ -381,8 +575,21 @@ def generate_analysis_report(
     show_private: bool = True,
     show_vms: bool = True,
 ) -> None:
-    """调用分析程序生成监控分析报告和趋势图"""
+    """
+    调用分析程序生成监控分析报告和趋势图
+    matplotlib与分析模块在此处延迟导入，避免监控期间常驻内存
+    """
     try:
+        # 设置matplotlib后端为Agg（无GUI，避免Qt依赖冲突）（核心修复2）
+        try:
+            import matplotlib
+
+            matplotlib.use("Agg")  # 强制使用非交互式后端，不加载Qt
+        except ImportError:
+            pass
+        # 导入内存分析模块
+        from memory_analyzer import analyze_log
+
         analyze_log(
             log_path=log_path,
             is_standalone=False,
@@ -465,7 +672,7 @@ def main():
         "pid": args.pid or config_data["pid"],
         "name": args.name or config_data["name"],
         "interval": args.interval or config_data["interval"],
-        "log_path": args.log_path or config_data["log_path"],
+        "log_path": Path(args.log_path or config_data["log_path"]),
         "max_log_size": args.max_log_size or config_data["max_log_size"],
         "show_rss": (
             args.show_rss if hasattr(args, "show_rss") else config_data["show_rss"]
@@ -509,13 +716,17 @@ def main():
     current_log_path = get_log_file_path(
         target_pid, proc_name, final_config["log_path"]
     )
-    log_file = open(current_log_path, "a", newline="", encoding="utf-8")
-    log_writer = csv.writer(log_file)
+    log_fd = open_log_file(current_log_path)
+    # 待写入的日志数据及当前日志文件已写入字节数（批量写入，避免逐行刷新）
+    pending = bytearray()
+    pending_rows = 0
+    pending_since = 0.0  # 缓存中最早一行的入缓存时间（monotonic）
+    bytes_written = os.fstat(log_fd).st_size
+    rows_since_reconcile = 0
 
     # 若日志文件为空，写入表头
-    if os.path.getsize(current_log_path) == 0:
-        write_log_header(log_writer)
-        log_file.flush()
+    if bytes_written == 0:
+        bytes_written += write_log_header(log_fd)
 
     print(f"\n[INFO] 开始监控进程：PID={target_pid}，名称={proc_name}")
     print(f"[INFO] 采样间隔：{final_config['interval']}秒")
@@ -523,82 +734,162 @@ def main():
     print(f"[INFO] 按Ctrl+C终止监控（退出后自动生成分析报告）...\n")
 
     # 8. 精准定时采样循环
+    # 循环外确定不变量并绑定局部名称，减少每次采样的重复开销
+    memory_sampler = select_memory_sampler(proc)
+    pct_factor = get_pct_factor()
+    max_log_size = final_config["max_log_size"]
+    interval = final_config["interval"]
+    _now = datetime.now
+    _fromtimestamp = datetime.fromtimestamp
+    sample_history = SampleBuffer()
+    _format_row = _ROW_FMT.format
+    # 进程名称在循环外做一次CSV安全处理
+    csv_proc_name = sanitize_csv_field(proc_name)
+    _monotonic = time.monotonic
     sample_count = 0
-    next_sample_time = time.perf_counter()
-    while not EXIT_FLAG:
+    # 采样循环轮数（含采集失败的轮次），用于定期刷新系统总内存
+    loop_count = 0
+    # 按固定时间网格计算采样截止时间（start + tick * interval），避免累积漂移
+    tick = 0
+    late_samples = 0
+    start_time = _monotonic()
+    while not EXIT_EVENT.is_set():
         try:
-            # 检查进程是否存活
-            if not proc.is_running():
+            # 采样内存数据
+            # 系统总内存极少变化，每隔若干轮刷新一次
+            # （按循环轮数计，连续采集失败时也不会每轮都重复读取）
+            if loop_count and loop_count % TOTAL_MEM_REFRESH_SAMPLES == 0:
+                pct_factor = get_pct_factor()
+            loop_count += 1
+            sample_data, remark = sample_process_memory(
+                proc, csv_proc_name, memory_sampler, pct_factor
+            )
+            # 采样时发现进程已退出，结束监控
+            if remark == REMARK_PROC_TERMINATED:
                 print("[ERROR] 目标进程已终止，监控结束！")
                 break
 
-            # 采样内存数据
-            sample_data, remark = sample_process_memory(proc)
-
             # 写入日志
             if sample_data:
-                log_writer.writerow(
-                    [
-                        sample_data["sample_time"],
-                        sample_data["pid"],
-                        sample_data["name"],
-                        sample_data["rss"],
-                        sample_data["vms"],
-                        sample_data["private"],  # 新增字段
-                        sample_data["mem_percent"],
-                        remark,
-                    ]
+                sample_history.append(
+                    sample_data["sample_ts"],
+                    sample_data["rss"],
+                    sample_data["vms"],
+                    sample_data["private"],
+                )
+                sample_time = _fromtimestamp(sample_data["sample_ts"]).isoformat(
+                    timespec="milliseconds"
+                )
+                row = _format_row(
+                    t=sample_time,
+                    pid=sample_data["pid"],
+                    name=sample_data["name"],
+                    rss=sample_data["rss"],
+                    vms=sample_data["vms"],
+                    priv=sample_data["private"],  # 新增字段
+                    pct=sample_data["mem_percent"],
+                    remark=remark,
                 )
                 # 控制台输出（新增专用工作集）
                 print(
-                    f"[{sample_data['sample_time']}] PID:{sample_data['pid']} | 物理内存:{sample_data['rss']} {MEMORY_UNIT} | 专用工作集:{sample_data['private']} {MEMORY_UNIT} | 虚拟内存:{sample_data['vms']} {MEMORY_UNIT} | 占比:{sample_data['mem_percent']}% | {remark}"
+                    f"[{sample_time}] PID:{sample_data['pid']} | 物理内存:{sample_data['rss']:.2f} {MEMORY_UNIT} | 专用工作集:{sample_data['private']:.2f} {MEMORY_UNIT} | 虚拟内存:{sample_data['vms']:.2f} {MEMORY_UNIT} | 占比:{sample_data['mem_percent']:.2f}% | {remark}"
                 )
                 sample_count += 1
             else:
                 # 采集失败，记录备注
-                sample_time = datetime.now().isoformat(timespec="milliseconds")
-                log_writer.writerow(
-                    [sample_time, target_pid, proc_name, "", "", "", "", remark]
-                )
+                sample_time = _now().isoformat(timespec="milliseconds")
+                if needs_csv_quoting(remark):
+                    # 异常信息可能含逗号/引号，走csv.writer兜底转义
+                    row = format_csv_row(
+                        [sample_time, target_pid, csv_proc_name, "", "", "", "", remark]
+                    )
+                else:
+                    row = _FAILED_ROW_FMT.format(
+                        t=sample_time, pid=target_pid, name=csv_proc_name, remark=remark
+                    )
                 print(f"[{sample_time}] 采集失败：{remark}")
-
-            # 日志刷新（避免崩溃丢失数据）
-            log_file.flush()
+                # 进程名称在循环外缓存，仅在采集异常时尝试刷新
+                try:
+                    proc_name = proc.name()
+                    csv_proc_name = sanitize_csv_field(proc_name)
+                except psutil.Error:
+                    pass
+
+            # 缓存日志行，攒满一批或最早一行滞留超时后统一写入并刷新
+            row_bytes = row.encode("utf-8")
+            if pending_rows == 0:
+                pending_since = _monotonic()
+            pending += row_bytes
+            pending_rows += 1
+            bytes_written += len(row_bytes)
+            rows_since_reconcile += 1
+            if (
+                pending_rows >= LOG_BATCH_SIZE
+                or len(pending) >= LOG_BUFFER_SIZE
+                or _monotonic() - pending_since >= LOG_FLUSH_MAX_AGE
+            ):
+                flush_log_buffer(log_fd, pending)
+                pending_rows = 0
+                # 写入后缓存为空，定期用打开的文件描述符校准文件大小
+                if rows_since_reconcile >= LOG_SIZE_RECONCILE_ROWS:
+                    bytes_written = os.fstat(log_fd).st_size
+                    rows_since_reconcile = 0
 
             # 检查日志文件大小，触发轮转
-            if os.path.getsize(current_log_path) >= final_config["max_log_size"]:
+            if bytes_written >= max_log_size:
                 print(
-                    f"[INFO] 日志文件已达{final_config['max_log_size']/1024/1024:.1f}MB，触发轮转..."
+                    f"[INFO] 日志文件已达{max_log_size/1024/1024:.1f}MB，触发轮转..."
                 )
-                log_file.close()
+                flush_log_buffer(log_fd, pending)
+                pending_rows = 0
+                os.close(log_fd)
                 current_log_path = get_next_log_file(current_log_path)
-                log_file = open(current_log_path, "a", newline="", encoding="utf-8")
-                log_writer = csv.writer(log_file)
-                write_log_header(log_writer)
-                log_file.flush()
+                log_fd = open_log_file(current_log_path)
+                bytes_written = write_log_header(log_fd)
+                rows_since_reconcile = 0
                 print(f"[INFO] 新日志文件：{current_log_path}")
 
-            # 精准定时（补偿sleep误差）
-            next_sample_time += final_config["interval"]
-            sleep_time = next_sample_time - time.perf_counter()
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            else:
-                # 若采样耗时超过间隔，立即执行下一次
-                next_sample_time = time.perf_counter()
-                print(
-                    f"[WARNING] 采样耗时超过间隔({final_config['interval']}秒)，跳过休眠"
-                )
+            # 采样间隔不大于0时不等待，连续采样（仅检查退出信号）
+            if interval <= 0:
+                if wait_for_exit(0):
+                    break
+                continue
+
+            # 精准定时：等待到下一个采样截止时间，收到退出信号时立即唤醒
+            tick += 1
+            deadline = start_time + tick * interval
+            now = _monotonic()
+            if now >= deadline:
+                # 若采样耗时超过间隔，跳过已错过的采样点并立即执行下一次
+                late_samples += 1
+                tick = int((now - start_time) // interval)
+                deadline = now
+            if wait_for_exit(deadline - now):
+                break
 
         except Exception as e:
             print(f"[ERROR] 采样循环异常：{str(e)}")
             # 休眠1秒避免死循环报错
-            time.sleep(1)
+            wait_for_exit(1)
             continue
 
-    # 9. 程序退出清理
-    log_file.close()
+    if EXIT_EVENT.is_set():
+        print("\n[INFO] 接收到退出信号，正在优雅终止监控...")
+    if late_samples:
+        print(
+            f"[WARNING] 共{late_samples}次采样耗时超过间隔({interval}秒)，已跳过休眠"
+        )
+
+    # 9. 程序退出清理（写入剩余缓存的日志行）
+    flush_log_buffer(log_fd, pending)
+    os.close(log_fd)
     print(f"\n[INFO] 监控结束！累计采样{sample_count}次")
+    if sample_history.size:
+        avg_rss, max_rss, min_rss = sample_history.stats("rss")
+        print(
+            f"[INFO] 最近{sample_history.size}次采样物理内存：平均值{avg_rss:.2f} {MEMORY_UNIT} | "
+            f"最大值{max_rss:.2f} {MEMORY_UNIT} | 最小值{min_rss:.2f} {MEMORY_UNIT}"
+        )
     print(f"[INFO] 日志文件已保存至：{current_log_path}")
 
     # 10. 生成分析报告和趋势图
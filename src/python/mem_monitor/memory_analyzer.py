@@ -1,18 +1,28 @@
 import os
 import sys
 import csv
+import mmap
+import re
 import argparse
+import functools
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
-# 提前设置matplotlib后端为Agg（无GUI）
+import numpy as np
+import pandas as pd
+
+# 可选：pyarrow多线程CSV解析（未安装时使用pandas解析）
 try:
-    import matplotlib
-    matplotlib.use('Agg')
-    import matplotlib.pyplot as plt
-    import matplotlib.font_manager as fm
+    import pyarrow as pa
+    import pyarrow.csv as pac
+except ImportError:
+    pac = None
+
+# 可选：numba编译统计内核（未安装时使用numpy实现）
+try:
+    from numba import njit
 except ImportError:
-    plt = None
+    njit = None
 
 # 内存单位转换（与主程序保持一致）
 MEMORY_UNIT = "MB"
@@ -23,6 +33,42 @@ UNIT_CONVERTER = {
     "GB": 1024 * 1024 * 1024
 }
 
+# 日志列名（与主程序写入的表头保持一致）
+TIME_COLUMN = "采样时间(ISO8601)"
+RSS_COLUMN = f"物理内存({MEMORY_UNIT})"
+VMS_COLUMN = f"虚拟内存({MEMORY_UNIT})"
+PRIVATE_COLUMN = f"专用工作集({MEMORY_UNIT})"
+# 日志采样时间格式（主程序以毫秒精度ISO8601写入），固定格式解析快于格式推断
+LOG_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+# 时间范围参数：两个以逗号分隔的时间点。日期与时间以T或空格分隔，时间部分可省略，
+# 也可只写到小时或分钟，毫秒可选（与datetime.fromisoformat接受的常用写法一致）。
+# 只捕获到秒的部分：起止时间都会按秒取整，毫秒无需解析
+_TR_TIMESTAMP = r"\s*(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2})(?::(\d{2})(?::(\d{2})(?:\.\d+)?)?)?)?\s*"
+_TR_RE = re.compile(_TR_TIMESTAMP + "," + _TR_TIMESTAMP)
+# 日志列名 -> 分析时使用的短列名（仅读取参与统计的内存指标列）
+ANALYSIS_COLUMNS = {
+    RSS_COLUMN: "rss",
+    VMS_COLUMN: "vms",
+    PRIVATE_COLUMN: "private",
+}
+
+# 内存指标的存储类型：报告保留两位小数，而Linux下虚拟内存常超过131072MB（float32在此量级已无法精确到0.01），
+# 因此不收窄为float32，统一使用float64存储
+METRIC_DTYPE = np.float64
+
+# 读取PID和进程名称时读取的文件开头字节数（覆盖表头和第一行数据）
+PID_PROBE_BYTES = 4096
+
+# 分块读取日志的大小（pandas按行数，pyarrow按字节数），峰值内存与日志大小无关
+LOG_CHUNK_ROWS = 200_000
+LOG_CHUNK_BYTES = 16 << 20
+# 低内存绘图模式下每个数据块最多保留的绘图点数
+LOW_MEMORY_PLOT_POINTS = 2000
+# 趋势图每条曲线的最大点数（12英寸x100dpi的图宽约1200像素，更多的点无法分辨）
+PLOT_MAX_POINTS = 5000
+# 趋势图输出分辨率（PNG概览图100dpi已足够）
+PLOT_DPI = 100
+
 # 字体文件配置 - 随程序分发的字体文件路径
 # 优先从程序同级的fonts文件夹读取simhei.ttf
 FONT_FILE_PATH = os.path.join(
@@ -41,30 +87,29 @@ def format_duration(total_seconds: float) -> str:
         - 秒数有小数时保留1位（如25.5秒）
         - 无小时/分钟时自动省略对应部分
     """
-    total_seconds = max(0, total_seconds)
-    hours = int(total_seconds // 3600)
-    minutes = int((total_seconds % 3600) // 60)
-    seconds = total_seconds % 60
+    # 先统一取整到0.1秒，之后全部为整数运算（避免浮点余数导致显示为59.99秒等）
+    total_tenths = max(0, round(total_seconds * 10))
+    hours, rem = divmod(total_tenths, 36000)
+    minutes, tenths = divmod(rem, 600)
+    seconds, tenth = divmod(tenths, 10)
     
     # 处理秒数显示格式：整数则去小数，非整数保留1位
-    if seconds.is_integer():
-        seconds_str = f"{int(seconds)}秒"
-    else:
-        seconds_str = f"{round(seconds, 1)}秒"
+    seconds_str = f"{seconds}秒" if tenth == 0 else f"{seconds}.{tenth}秒"
     
     parts = []
     if hours > 0:
         parts.append(f"{hours}小时")
-    if minutes > 0 or (hours > 0 and seconds > 0):
+    if minutes > 0 or (hours > 0 and tenths > 0):
         parts.append(f"{minutes}分钟")
-    if seconds > 0 or (hours == 0 and minutes == 0):
+    if tenths > 0 or (hours == 0 and minutes == 0):
         parts.append(seconds_str)
     
     return "".join(parts) if parts else "0秒"
 
 def parse_time_range(time_range_str: str) -> Optional[Tuple[datetime, datetime]]:
     """
-    解析时间范围参数（格式：YYYY-MM-DDTHH:MM:SS.fff,YYYY-MM-DDTHH:MM:SS.fff 或 YYYY-MM-DD HH:MM:SS,YYYY-MM-DD HH:MM:SS）
+    解析时间范围参数（格式：YYYY-MM-DDTHH:MM:SS.fff,YYYY-MM-DDTHH:MM:SS.fff 或 YYYY-MM-DD HH:MM:SS,YYYY-MM-DD HH:MM:SS，
+    时间部分可省略或只写到小时/分钟）
     处理逻辑：
         - 起始时间：向下取整到秒（截断毫秒）
         - 终止时间：向上取整到秒（去掉毫秒后+1秒）
@@ -72,49 +117,352 @@ def parse_time_range(time_range_str: str) -> Optional[Tuple[datetime, datetime]]
     if not time_range_str:
         return None
     
+    # 兼容T分隔和空格分隔的格式
+    match = _TR_RE.fullmatch(time_range_str)
+    if match is None:
+        print(f"[WARNING] 时间范围格式不正确：{time_range_str}，将使用全部数据")
+        return None
+    
+    # 各分组依次为起始/终止时间的年、月、日、时、分、秒，省略的部分按0处理
+    fields = [int(v) if v else 0 for v in match.groups()]
     try:
-        # 兼容T分隔和空格分隔的格式
-        time_range_str = time_range_str.replace("T", " ")
-        start_str, end_str = time_range_str.split(',')
-        
-        # 解析原始时间（保留毫秒）
-        start_time = datetime.fromisoformat(start_str.strip())
-        end_time = datetime.fromisoformat(end_str.strip())
-        
         # 起始时间向下取整到秒（截断毫秒）
-        start_time_floor = start_time.replace(microsecond=0)
+        start_time_floor = datetime(*fields[:6])
         # 终止时间向上取整到秒（去掉毫秒+1秒）
-        end_time_ceil = end_time.replace(microsecond=0) + timedelta(seconds=1)
-        
-        return (start_time_floor, end_time_ceil)
-    except Exception as e:
+        end_time_ceil = datetime(*fields[6:]) + timedelta(seconds=1)
+    except ValueError as e:
         print(f"[WARNING] 时间范围解析失败：{str(e)}，将使用全部数据")
         return None
+    
+    return (start_time_floor, end_time_ceil)
+
+def _chunk_stats_loop(rss: np.ndarray, private: np.ndarray, vms: np.ndarray) -> np.ndarray:
+    """
+    单次遍历同时更新三项指标的总和/最小值/最大值（每个采样只读取一次），供numba编译
+    返回3x3矩阵：行依次为rss/private/vms，列依次为总和/最小值/最大值
+    """
+    n = rss.shape[0]
+    sum_r = 0.0
+    sum_p = 0.0
+    sum_v = 0.0
+    min_r = max_r = rss[0]
+    min_p = max_p = private[0]
+    min_v = max_v = vms[0]
+    for i in range(n):
+        r = rss[i]
+        p = private[i]
+        v = vms[i]
+        sum_r += r
+        sum_p += p
+        sum_v += v
+        if r < min_r:
+            min_r = r
+        if r > max_r:
+            max_r = r
+        if p < min_p:
+            min_p = p
+        if p > max_p:
+            max_p = p
+        if v < min_v:
+            min_v = v
+        if v > max_v:
+            max_v = v
+    stats = np.empty((3, 3))
+    stats[0, 0], stats[0, 1], stats[0, 2] = sum_r, min_r, max_r
+    stats[1, 0], stats[1, 1], stats[1, 2] = sum_p, min_p, max_p
+    stats[2, 0], stats[2, 1], stats[2, 2] = sum_v, min_v, max_v
+    return stats
+
+def _chunk_stats_numpy(rss: np.ndarray, private: np.ndarray, vms: np.ndarray) -> np.ndarray:
+    """numpy实现：三项指标堆叠为矩阵后按行归约，返回格式同_chunk_stats_loop"""
+    stats_mat = np.stack([rss, private, vms])
+    return np.stack([stats_mat.sum(axis=1), stats_mat.min(axis=1), stats_mat.max(axis=1)], axis=1)
 
-def get_pid_and_name_from_log(log_path: str) -> Tuple[Optional[int], Optional[str]]:
-    """从日志文件中获取PID和进程名称"""
+# 计算单个数据块内各内存指标的部分统计量，已安装numba时编译为机器码并缓存
+if njit is None:
+    compute_chunk_stats = _chunk_stats_numpy
+else:
     try:
-        with open(log_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            # 跳过表头
-            next(reader)
-            # 读取第一行数据
-            first_row = next(reader)
-            if len(first_row) >= 3:
-                pid = int(first_row[1]) if first_row[1].isdigit() else None
-                name = first_row[2]
-                return (pid, name)
+        compute_chunk_stats = njit(cache=True, fastmath=True)(_chunk_stats_loop)
+    except Exception:
+        # 打包运行（如PyInstaller）时源文件不在磁盘上，numba无法定位缓存目录，改为不缓存的编译
+        try:
+            compute_chunk_stats = njit(fastmath=True)(_chunk_stats_loop)
+        except Exception:
+            compute_chunk_stats = _chunk_stats_numpy
+
+class MetricAccumulator:
+    """
+    流式累计内存指标（rss/private/vms）的统计量：样本数、总和、最小值、最大值、首末值及其时间
+    按数据块更新，内存占用与日志大小无关
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.sums = np.zeros(3)
+        self.mins = np.full(3, np.inf)
+        self.maxs = np.full(3, -np.inf)
+        self.first_vals = None
+        self.first_time = None
+        self.last_vals = None
+        self.last_time = None
+
+    def update(self, times: np.ndarray, rss: np.ndarray, private: np.ndarray, vms: np.ndarray) -> None:
+        """合并一个数据块（数组非空）"""
+        partial = compute_chunk_stats(rss, private, vms)
+        self.sums += partial[:, 0]
+        np.minimum(self.mins, partial[:, 1], out=self.mins)
+        np.maximum(self.maxs, partial[:, 2], out=self.maxs)
+        if self.n == 0:
+            self.first_vals = np.array([rss[0], private[0], vms[0]])
+            self.first_time = times[0]
+        self.last_vals = np.array([rss[-1], private[-1], vms[-1]])
+        self.last_time = times[-1]
+        self.n += len(rss)
+
+    def duration_seconds(self) -> float:
+        """首末采样的时间跨度（秒），datetime64整数运算"""
+        return (self.last_time - self.first_time) / np.timedelta64(1, "s")
+
+    def stats(self) -> np.ndarray:
+        """
+        返回3x4矩阵：行依次为rss/private/vms，列依次为平均值/最小值/最大值/增长率（MB/分钟）
+        """
+        result = np.zeros((3, 4))
+        result[:, 0] = self.sums / self.n
+        result[:, 1] = self.mins
+        result[:, 2] = self.maxs
+        duration_min = self.duration_seconds() / 60
+        if duration_min > 0 and self.n > 1:
+            result[:, 3] = (self.last_vals - self.first_vals) / duration_min
+        return result
+
+def parse_log_times(time_strs: pd.Series) -> pd.Series:
+    """
+    批量解析日志采样时间列，无法解析的值返回NaT
+    优先按固定格式解析，少量不符合格式的值（如无毫秒部分）再按通用ISO8601解析
+    """
+    times = pd.to_datetime(time_strs, format=LOG_TIME_FORMAT, errors="coerce", cache=True)
+    unparsed = times.isna() & time_strs.notna()
+    if unparsed.any():
+        times[unparsed] = pd.to_datetime(time_strs[unparsed], format="ISO8601", errors="coerce")
+    return times
+
+def map_log_file(log_path: str) -> mmap.mmap:
+    """以只读内存映射方式打开日志文件（由内核按需分页读取，避免额外的读缓冲拷贝）"""
+    with open(log_path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def open_log_source(log_path: str) -> Any:
+    """
+    以只读内存映射方式打开日志，整个分析过程只使用这一个数据源（支持read/seek）：
+    已安装pyarrow时由pyarrow映射（其CSV读取器可直接读取，不导出Python mmap的缓冲区），否则使用Python mmap
+    """
+    if pac is not None:
+        return pa.memory_map(log_path)
+    return map_log_file(log_path)
+
+def select_analysis_columns(show_rss: bool, show_private: bool, show_vms: bool) -> Dict[str, str]:
+    """
+    按显示参数选择需要读取的内存指标列（日志列名 -> 短列名），不显示的指标不读取不解析
+    全部不显示时仍读取物理内存列，用于识别采集失败的行和统计采样次数
+    """
+    shown = {"rss": show_rss, "private": show_private, "vms": show_vms}
+    columns = {col: name for col, name in ANALYSIS_COLUMNS.items() if shown[name]}
+    return columns or {RSS_COLUMN: "rss"}
+
+def _iter_log_chunks_arrow(source: Any, columns: Dict[str, str]) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """
+    使用pyarrow流式读取器（多线程）分块解析日志，采样时间列直接解析为时间戳
+    逐块返回(数据块, 无效行数)；存在格式异常的值时抛出ArrowInvalid，因此无效行数恒为0
+    """
+    source.seek(0)
+    reader = pac.open_csv(
+        source,
+        read_options=pac.ReadOptions(use_threads=True, block_size=LOG_CHUNK_BYTES),
+        convert_options=pac.ConvertOptions(
+            include_columns=[TIME_COLUMN, *columns],
+            column_types={
+                TIME_COLUMN: pa.timestamp("ms"),
+                **{col: pa.from_numpy_dtype(METRIC_DTYPE) for col in columns},
+            },
+        ),
+    )
+    for batch in reader:
+        df = batch.to_pandas().rename(columns=columns)
+        df["time"] = df.pop(TIME_COLUMN)
+        yield df, 0
+
+def _iter_log_chunks_pandas(source: Any, columns: Dict[str, str]) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """
+    使用pandas按行数分块解析日志，逐列向量化容错：无法解析的值置为NaN/NaT，
+    逐块返回(数据块, 含无法解析值的行数)
+    """
+    source.seek(0)
+    with pd.read_csv(
+        source,
+        encoding="utf-8",
+        usecols=[TIME_COLUMN, *columns],
+        chunksize=LOG_CHUNK_ROWS,
+    ) as reader:
+        for df in reader:
+            df = df.rename(columns=columns)
+            # 时间列整列批量解析，无法解析的值为NaT
+            raw_times = df.pop(TIME_COLUMN)
+            df["time"] = parse_log_times(raw_times)
+            invalid = raw_times.notna() & df["time"].isna()
+            # 数值列整列转换，无法解析的值为NaN（空字段为采集失败行，不计为无效）
+            for col in columns.values():
+                raw = df[col]
+                df[col] = pd.to_numeric(raw, errors="coerce").astype(METRIC_DTYPE)
+                invalid |= raw.notna() & df[col].isna()
+            yield df, int(invalid.sum())
+
+def _scan_log_chunks(
+    chunks: Iterator[Tuple[pd.DataFrame, int]],
+    metric_names: List[str],
+    time_range: Optional[Tuple[datetime, datetime]],
+    low_memory_plot: bool
+) -> Dict[str, Any]:
+    """
+    逐块扫描日志：统计全量数据的首末时间和采样数，按时间范围筛选后累计分析统计量，
+    并收集绘图数据（低内存模式下每块按步长抽稀）
+    未读取的指标（metric_names之外）按0参与统计，也不收集绘图数据
+    """
+    scan = {
+        "valid_rows": 0,        # 内存字段非空的行数
+        "invalid_rows": 0,      # 含无法解析值而被跳过的行数
+        "total_samples": 0,     # 内存字段非空且采样时间有效的行数
+        "first_time": None,
+        "last_time": None,
+        "metrics": MetricAccumulator(),
+        # 绘图数据按列分别收集各数据块的数组，结束时每列各拼接一次
+        "plot_columns": {name: [] for name in ["time", *metric_names]},
+    }
+    if time_range:
+        start64, end64 = np.datetime64(time_range[0]), np.datetime64(time_range[1])
+    for df, invalid in chunks:
+        scan["invalid_rows"] += invalid
+        # 过滤采集失败的行（内存字段为空）及含无法解析值的行
+        df = df.dropna(subset=metric_names[:1])
+        scan["valid_rows"] += len(df)
+        df = df.dropna(subset=["time", *metric_names[1:]])
+        if df.empty:
+            continue
+        time_values = df["time"].to_numpy()
+        if scan["first_time"] is None:
+            scan["first_time"] = time_values[0]
+        scan["last_time"] = time_values[-1]
+        scan["total_samples"] += len(df)
+        
+        if time_range:
+            if df["time"].is_monotonic_increasing:
+                # 块内采样时间有序：二分查找确定起止下标，O(log N)切片
+                i0 = time_values.searchsorted(start64, side="left")
+                i1 = time_values.searchsorted(end64, side="right")
+                df = df.iloc[i0:i1]
+                time_values = time_values[i0:i1]
+            else:
+                # 时间非单调（如系统时钟被回拨），使用向量化布尔掩码筛选
+                in_range = (time_values >= start64) & (time_values <= end64)
+                df = df[in_range]
+                time_values = time_values[in_range]
+            if df.empty:
+                continue
+        
+        values = {name: df[name].to_numpy() for name in metric_names}
+        zeros = np.zeros(len(df), dtype=METRIC_DTYPE)
+        scan["metrics"].update(
+            time_values, values.get("rss", zeros), values.get("private", zeros), values.get("vms", zeros)
+        )
+        
+        values["time"] = time_values
+        stride = 1
+        if low_memory_plot and len(df) > LOW_MEMORY_PLOT_POINTS:
+            stride = -(-len(df) // LOW_MEMORY_PLOT_POINTS)
+        for name, arrays in scan["plot_columns"].items():
+            arrays.append(values[name][::stride])
+    return scan
+
+def scan_log(
+    source: Any,
+    time_range: Optional[Tuple[datetime, datetime]] = None,
+    low_memory_plot: bool = False,
+    columns: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    分块流式扫描日志数据（列：time及columns指定的内存指标，默认全部），峰值内存为O(块大小)
+    source为open_log_source打开的数据源；已安装pyarrow时优先使用其多线程解析，
+    存在格式异常的行时从头重新使用pandas逐列容错解析（同一数据源）
+    """
+    columns = columns or ANALYSIS_COLUMNS
+    metric_names = list(columns.values())
+    if pac is not None:
+        try:
+            return _scan_log_chunks(_iter_log_chunks_arrow(source, columns), metric_names, time_range, low_memory_plot)
+        except pa.ArrowInvalid:
+            pass
+    return _scan_log_chunks(_iter_log_chunks_pandas(source, columns), metric_names, time_range, low_memory_plot)
+
+def downsample_minmax(
+    times: np.ndarray, values: np.ndarray, max_points: int = PLOT_MAX_POINTS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    绘图前降采样：按时间顺序分桶，每桶保留最小值和最大值对应的采样点，
+    在减少点数的同时保留曲线的峰谷包络（点数不超过max_points时原样返回）
+    """
+    n = len(values)
+    if n <= max_points:
+        return times, values
+    bucket_size = -(-n // (max_points // 2))
+    full = n - n % bucket_size
+    buckets = values[:full].reshape(-1, bucket_size)
+    offsets = np.arange(0, full, bucket_size)
+    keep = [offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1)]
+    if full < n:
+        tail = values[full:]
+        keep.append(np.array([full + tail.argmin(), full + tail.argmax()]))
+    idx = np.unique(np.concatenate(keep))
+    return times[idx], values[idx]
+
+def read_pid_and_name(source: Any) -> Tuple[Optional[int], Optional[str]]:
+    """
+    从日志数据源中获取PID和进程名称（仅读取开头的表头和第一行数据），读取后复位到文件开头，
+    同一数据源可直接交给批量解析继续使用
+    """
+    try:
+        # 表头和第一行数据都很短，读取文件开头一小段即可
+        lines = source.read(PID_PROBE_BYTES).split(b"\n", 2)
+        if len(lines) < 2:
+            return (None, None)
+        # 第一行数据（主程序写入的进程名已替换逗号/引号，可直接按逗号拆分）
+        first_line = lines[1].decode("utf-8")
+        if '"' in first_line:
+            first_row = next(csv.reader([first_line]), [])
+        else:
+            first_row = first_line.split(",", 3)
+        if len(first_row) >= 3:
+            pid = int(first_row[1]) if first_row[1].isdigit() else None
+            name = first_row[2]
+            return (pid, name)
     except Exception as e:
         print(f"[WARNING] 从日志文件获取PID和名称失败：{str(e)}")
+    finally:
+        source.seek(0)
     return (None, None)
 
+@functools.lru_cache(maxsize=1)
 def setup_chinese_font():
     """
     配置matplotlib中文显示：
     1. 优先使用本地fonts文件夹中的字体文件
     2. 其次自动检测系统可用字体
     3. 最后使用matplotlib自带字体兜底
+    字体配置写入全局rcParams，进程内只需执行一次，批量分析多个日志时复用结果
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.font_manager as fm
+    
     # 1：使用本地分发的字体文件（最高优先级）
     if os.path.exists(FONT_FILE_PATH):
         try:
@@ -132,7 +480,7 @@ def setup_chinese_font():
             print(f"[WARNING] 加载本地字体文件失败: {e}，尝试使用系统字体")
     
     # 2：自动检测系统可用字体
-    available_fonts = [f.name for f in fm.fontManager.ttflist]
+    available_fonts = {f.name for f in fm.fontManager.ttflist}
     selected_font = None
     
     for font_name in FONT_PRIORITY_LIST:
@@ -157,7 +505,8 @@ def analyze_log(
     is_standalone: bool = True,
     show_rss: bool = True,
     show_private: bool = True,
-    show_vms: bool = True
+    show_vms: bool = True,
+    low_memory_plot: bool = False
 ) -> None:
     """
     分析日志文件并生成报告和趋势图
@@ -170,6 +519,7 @@ def analyze_log(
         show_rss: 是否显示物理内存（工作集）统计
         show_private: 是否显示专用工作集统计
         show_vms: 是否显示虚拟内存统计
+        low_memory_plot: 是否对每个数据块抽稀后再绘图（超大日志时限制绘图数据的内存占用）
     """
     if not os.path.exists(log_path):
         print(f"[ERROR] 日志文件 {log_path} 不存在")
@@ -181,17 +531,17 @@ def analyze_log(
     else:
         output_dir = os.path.dirname(log_path) or '.'
     
-    # 从日志获取PID和进程名称
-    proc_pid, proc_name = get_pid_and_name_from_log(log_path)
-    proc_pid = proc_pid or "unknown"
-    proc_name = proc_name or "unknown_process"
-    
-    # 读取日志数据
+    # 日志文件只打开一次：先从开头两行获取PID和进程名称，再分块流式读取日志数据并累计统计量
     try:
-        with open(log_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            rows = [row for row in reader if row["物理内存(MB)"] and row["物理内存(MB)"] != ""]
-        if not rows:
+        with open_log_source(log_path) as source:
+            proc_pid, proc_name = read_pid_and_name(source)
+            columns = select_analysis_columns(show_rss, show_private, show_vms)
+            scan = scan_log(source, time_range, low_memory_plot, columns)
+        if scan["invalid_rows"]:
+            print(f"[WARNING] 跳过 {scan['invalid_rows']} 条无效数据行")
+        proc_pid = proc_pid or "unknown"
+        proc_name = proc_name or "unknown_process"
+        if scan["valid_rows"] == 0:
             print("[WARNING] 日志文件无有效数据，无法生成分析报告")
             return
     except Exception as e:
@@ -200,85 +550,52 @@ def analyze_log(
     
     # 数据预处理：先处理整体数据（所有有效日志），再处理筛选后的数据
     try:
-        # 1. 处理整体日志数据（未筛选）
-        all_processed_rows = []
-        for row in rows:
-            try:
-                row_time = datetime.fromisoformat(row["采样时间(ISO8601)"])
-                all_processed_rows.append({
-                    "time": row_time,
-                    "rss": float(row["物理内存(MB)"]),
-                    "vms": float(row["虚拟内存(MB)"]),
-                    "private": float(row["专用工作集(MB)"]),
-                    "mem_percent": float(row["物理内存占系统总内存(%)"])
-                })
-            except Exception as e:
-                print(f"[WARNING] 跳过无效数据行：{str(e)}")
-                continue
-        
-        if not all_processed_rows:
+        # 1. 整体日志数据（未筛选）统计
+        if scan["total_samples"] == 0:
             print("[WARNING] 没有有效日志数据，无法生成分析报告")
             return
         
-        # 整体数据统计
-        all_time_list = [row["time"] for row in all_processed_rows]
-        total_samples_all = len(all_processed_rows)
-        all_duration_seconds = (all_time_list[-1] - all_time_list[0]).total_seconds()
+        first_time = pd.Timestamp(scan["first_time"]).to_pydatetime()
+        last_time = pd.Timestamp(scan["last_time"]).to_pydatetime()
+        total_samples_all = scan["total_samples"]
+        all_duration_seconds = (scan["last_time"] - scan["first_time"]) / np.timedelta64(1, "s")
         all_duration_str = format_duration(all_duration_seconds)
         
-        # 2. 处理筛选后的数据（分析数据）
-        processed_rows = []
-        if time_range:
-            start_time, end_time = time_range
-            for row in all_processed_rows:
-                if start_time <= row["time"] <= end_time:
-                    processed_rows.append(row)
-        else:
-            # 未指定时间范围，分析全部数据
-            processed_rows = all_processed_rows
-            time_range = (all_time_list[0].replace(microsecond=0), 
-                          all_time_list[-1].replace(microsecond=0) + timedelta(seconds=1))
+        # 2. 筛选后的数据（分析数据），未指定时间范围时分析全部数据
+        if not time_range:
+            time_range = (first_time.replace(microsecond=0), 
+                          last_time.replace(microsecond=0) + timedelta(seconds=1))
         
-        if not processed_rows:
+        metrics = scan["metrics"]
+        if metrics.n == 0:
             print("[WARNING] 没有符合分析时间范围的数据，无法生成分析报告")
             return
         
         # 分析数据统计
-        analysis_time_list = [row["time"] for row in processed_rows]
-        total_samples_analysis = len(processed_rows)
-        analysis_duration_seconds = (analysis_time_list[-1] - analysis_time_list[0]).total_seconds()
+        total_samples_analysis = metrics.n
+        analysis_duration_seconds = metrics.duration_seconds()
         analysis_duration_str = format_duration(analysis_duration_seconds)
         
-        # 提取核心分析数据
-        rss_list = [row["rss"] for row in processed_rows]
-        private_list = [row["private"] for row in processed_rows]
-        vms_list = [row["vms"] for row in processed_rows]
-        
-        # 计算统计指标
-        # 物理内存（RSS）
-        avg_rss = round(sum(rss_list) / total_samples_analysis, 2) if show_rss else 0
-        max_rss = round(max(rss_list), 2) if show_rss else 0
-        min_rss = round(min(rss_list), 2) if show_rss else 0
-        # 专用工作集
-        avg_private = round(sum(private_list) / total_samples_analysis, 2) if show_private else 0
-        max_private = round(max(private_list), 2) if show_private else 0
-        min_private = round(min(private_list), 2) if show_private else 0
-        # 虚拟内存
-        avg_vms = round(sum(vms_list) / total_samples_analysis, 2) if show_vms else 0
-        max_vms = round(max(vms_list), 2) if show_vms else 0
-        min_vms = round(min(vms_list), 2) if show_vms else 0
+        # 绘图数据（列式numpy数组）
+        plot_data = {col: np.concatenate(arrays) for col, arrays in scan["plot_columns"].items()}
+        analysis_time_list = plot_data["time"]
+        rss_list = plot_data.get("rss")
+        private_list = plot_data.get("private")
+        vms_list = plot_data.get("vms")
         
-        # 计算各内存指标增长率（每分钟）
-        def calculate_growth_rate(values: list, duration_min: float) -> float:
-            """计算内存增长率（MB/分钟）"""
-            if duration_min <= 0 or len(values) <= 1:
-                return 0.0
-            return round((values[-1] - values[0]) / duration_min, 2)
+        # 统计指标（平均值/最小值/最大值/增长率）由各数据块的部分统计量合并得到
+        stats = np.round(metrics.stats(), 2).tolist()
+        avg_rss, min_rss, max_rss, rss_growth_rate = stats[0]
+        avg_private, min_private, max_private, private_growth_rate = stats[1]
+        avg_vms, min_vms, max_vms, vms_growth_rate = stats[2]
         
-        analysis_duration_min = analysis_duration_seconds / 60  # 分析时长（分钟）
-        rss_growth_rate = calculate_growth_rate(rss_list, analysis_duration_min) if show_rss else 0
-        private_growth_rate = calculate_growth_rate(private_list, analysis_duration_min) if show_private else 0
-        vms_growth_rate = calculate_growth_rate(vms_list, analysis_duration_min) if show_vms else 0
+        # 不显示的指标置0
+        if not show_rss:
+            avg_rss = max_rss = min_rss = rss_growth_rate = 0
+        if not show_private:
+            avg_private = max_private = min_private = private_growth_rate = 0
+        if not show_vms:
+            avg_vms = max_vms = min_vms = vms_growth_rate = 0
         
         # 生成文件名（独立模式添加标记）
         base_name = os.path.splitext(os.path.basename(log_path))[0]
@@ -292,55 +609,59 @@ def analyze_log(
         report_path = os.path.join(output_dir, f"{base_name}{report_suffix}")
         graph_path = os.path.join(output_dir, f"{base_name}{graph_suffix}")
         
-        # 生成文本报告（按要求拆分监控/分析维度）
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write("===== 进程内存监控分析报告 =====\n")
-            f.write(f"监控进程：PID={proc_pid} | 名称={proc_name}\n")
-            
+        # 生成文本报告（按要求拆分监控/分析维度），先拼接全部内容再一次写入
+        parts = [
+            "===== 进程内存监控分析报告 =====\n",
+            f"监控进程：PID={proc_pid} | 名称={proc_name}\n",
             # 监控维度（整体日志数据）
-            f.write(f"\n【监控维度（全量数据）】\n")
-            f.write(f"监控时间段：{all_time_list[0].strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]} ~ {all_time_list[-1].strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\n")
-            f.write(f"监控时长：{all_duration_str} | 总采样次数：{total_samples_all}\n")
-            
+            f"\n【监控维度（全量数据）】\n",
+            f"监控时间段：{first_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]} ~ {last_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}\n",
+            f"监控时长：{all_duration_str} | 总采样次数：{total_samples_all}\n",
             # 分析维度（筛选后数据）
-            f.write(f"\n【分析维度（指定时段）】\n")
-            f.write(f"分析时间范围：{time_range[0].strftime('%Y-%m-%d %H:%M:%S')} ~ {time_range[1].strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"分析时长：{analysis_duration_str} | 时段内采样次数：{total_samples_analysis}\n")
-            
-            # 内存统计（基于分析维度，根据参数控制显示）
-            if show_rss:
-                f.write("\n【物理内存（工作集）统计】\n")
-                f.write(f"平均值：{avg_rss} MB | 最大值：{max_rss} MB | 最小值：{min_rss} MB\n")
-                f.write(f"内存增长率：{rss_growth_rate} MB/分钟（正值=增长，负值=下降）\n")
-            
-            if show_private:
-                f.write("\n【专用工作集统计】\n")
-                f.write(f"平均值：{avg_private} MB | 最大值：{max_private} MB | 最小值：{min_private} MB\n")
-                f.write(f"内存增长率：{private_growth_rate} MB/分钟（正值=增长，负值=下降）\n")
-            
-            if show_vms:
-                f.write("\n【虚拟内存统计】\n")
-                f.write(f"平均值：{avg_vms} MB | 最大值：{max_vms} MB | 最小值：{min_vms} MB\n")
-                f.write(f"内存增长率：{vms_growth_rate} MB/分钟（正值=增长，负值=下降）\n")
-            
-            f.write("\n===== 报告生成完成 =====\n")
+            f"\n【分析维度（指定时段）】\n",
+            f"分析时间范围：{time_range[0].strftime('%Y-%m-%d %H:%M:%S')} ~ {time_range[1].strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"分析时长：{analysis_duration_str} | 时段内采样次数：{total_samples_analysis}\n",
+        ]
+        
+        # 内存统计（基于分析维度，根据参数控制显示）
+        if show_rss:
+            parts.append("\n【物理内存（工作集）统计】\n")
+            parts.append(f"平均值：{avg_rss} MB | 最大值：{max_rss} MB | 最小值：{min_rss} MB\n")
+            parts.append(f"内存增长率：{rss_growth_rate} MB/分钟（正值=增长，负值=下降）\n")
+        
+        if show_private:
+            parts.append("\n【专用工作集统计】\n")
+            parts.append(f"平均值：{avg_private} MB | 最大值：{max_private} MB | 最小值：{min_private} MB\n")
+            parts.append(f"内存增长率：{private_growth_rate} MB/分钟（正值=增长，负值=下降）\n")
+        
+        if show_vms:
+            parts.append("\n【虚拟内存统计】\n")
+            parts.append(f"平均值：{avg_vms} MB | 最大值：{max_vms} MB | 最小值：{min_vms} MB\n")
+            parts.append(f"内存增长率：{vms_growth_rate} MB/分钟（正值=增长，负值=下降）\n")
+        
+        parts.append("\n===== 报告生成完成 =====\n")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write("".join(parts))
         print(f"[INFO] 分析报告已生成：{report_path}")
         
         # 生成趋势图
         try:
-            if plt is None:
-                raise ImportError("matplotlib未安装")
+            # 延迟导入matplotlib（仅生成趋势图时加载），设置后端为Agg（无GUI）
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as plt
             
             # 配置中文字体（优先本地字体文件）
             setup_chinese_font()
             
             fig, ax = plt.subplots(figsize=(12, 6))
+            # 各指标独立降采样后再绘制
             if show_rss:
-                ax.plot(analysis_time_list, rss_list, label=f"物理内存（工作集）({MEMORY_UNIT})", color="blue", linewidth=1.5)
+                ax.plot(*downsample_minmax(analysis_time_list, rss_list), label=f"物理内存（工作集）({MEMORY_UNIT})", color="blue", linewidth=1.5, rasterized=True)
             if show_private:
-                ax.plot(analysis_time_list, private_list, label=f"专用工作集({MEMORY_UNIT})", color="red", linewidth=1.5)
+                ax.plot(*downsample_minmax(analysis_time_list, private_list), label=f"专用工作集({MEMORY_UNIT})", color="red", linewidth=1.5, rasterized=True)
             if show_vms:
-                ax.plot(analysis_time_list, vms_list, label=f"虚拟内存({MEMORY_UNIT})", color="green", linewidth=1.0, linestyle="--")
+                ax.plot(*downsample_minmax(analysis_time_list, vms_list), label=f"虚拟内存({MEMORY_UNIT})", color="green", linewidth=1.0, linestyle="--", rasterized=True)
             
             ax.set_xlabel("采样时间", fontsize=10)
             ax.set_ylabel(f"内存占用({MEMORY_UNIT})", fontsize=10)
@@ -348,9 +669,10 @@ def analyze_log(
             ax.legend(fontsize=9)
             ax.grid(True, alpha=0.3)
             plt.xticks(rotation=45)
-            plt.tight_layout()
+            # 固定边距代替tight_layout（省去一次完整的布局求解），底部留出旋转后刻度标签的空间
+            fig.subplots_adjust(left=0.07, right=0.98, top=0.94, bottom=0.2)
             
-            plt.savefig(graph_path, dpi=150, bbox_inches="tight")
+            plt.savefig(graph_path, dpi=PLOT_DPI, bbox_inches="tight")
             plt.close()
             print(f"[INFO] 内存趋势图已生成：{graph_path}")
         except ImportError:
@@ -370,6 +692,7 @@ def main():
     parser.add_argument("--no-rss", action="store_false", dest="show_rss", help="不显示物理内存（工作集）统计")
     parser.add_argument("--no-private", action="store_false", dest="show_private", help="不显示专用工作集统计")
     parser.add_argument("--no-vms", action="store_false", dest="show_vms", help="不显示虚拟内存统计")
+    parser.add_argument("--low-memory-plot", action="store_true", help="超大日志分块抽稀后绘图，降低内存占用")
     args = parser.parse_args()
     
     # 解析时间范围
@@ -383,7 +706,8 @@ def main():
         is_standalone=True,
         show_rss=args.show_rss,
         show_private=args.show_private,
-        show_vms=args.show_vms
+        show_vms=args.show_vms,
+        low_memory_plot=args.low_memory_plot
     )
 
 if __name__ == "__main__":